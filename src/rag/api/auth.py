@@ -1,6 +1,13 @@
+import hashlib
+import hmac
+import os
+import time
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
+_VALID_API_KEY = os.getenv("API_KEY", "valid_api_key").encode()
+
 
 def check_api_key(api_key: str) -> bool:
     """
@@ -9,7 +16,7 @@ def check_api_key(api_key: str) -> bool:
     """
     # Placeholder for actual API key validation logic
     # For example, you might check against a database or an environment variable
-    return api_key == "valid_api_key"
+    return hmac.compare_digest(api_key.encode(), _VALID_API_KEY)
 
 
 def get_user_from_api_key(api_key: str):
@@ -24,11 +31,35 @@ def get_user_from_api_key(api_key: str):
 
 api_key_header = APIKeyHeader(name="X-API-Key")
 
+# Successful validations, keyed by a digest of the API key so raw keys are
+# never retained in memory.
+_TTL = 60.0
+_key_cache: dict[bytes, tuple[float, dict]] = {}
+
+
+def _cache_key(api_key: str) -> bytes:
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+def invalidate(api_key: str) -> None:
+    """
+    Drop a cached validation, e.g. when the API key is revoked.
+    """
+    _key_cache.pop(_cache_key(api_key), None)
+
+
+async def get_user(api_key_header: str = Security(api_key_header)):
+    now = time.monotonic()
+    cache_key = _cache_key(api_key_header)
+    cached = _key_cache.get(cache_key)
+    if cached is not None and now - cached[0] < _TTL:
+        return cached[1]
 
-def get_user(api_key_header: str = Security(api_key_header)):
     if check_api_key(api_key_header):
         user = get_user_from_api_key(api_key_header)
+        _key_cache[cache_key] = (now, user)
         return user
+    _key_cache.pop(cache_key, None)
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Missing or invalid API key",
@@ -4,22 +4,26 @@ from qdrant_client import AsyncQdrantClient
 from rag.models.loaders import ColQwen2_5_Processor, ColQwen2_5Loader
 from rag.services.image_manager import S3JPEGManager
 
+# Lifespan state lives in `scope["state"]` as the plain dict described by
+# `rag.api.state.State`; reading it directly skips building the per-request
+# `request.state` wrapper and its `__getattr__` lookups.
+
 
 async def get_qdrant_client(request: Request) -> AsyncQdrantClient:
-    return request.state.qdrant_client
+    return request.scope["state"]["qdrant_client"]
 
 
 async def get_colpali_model(request: Request) -> ColQwen2_5Loader:
-    return request.state.model
+    return request.scope["state"]["model"]
 
 
 async def get_colpali_processor(request: Request) -> ColQwen2_5_Processor:
-    return request.state.processor
+    return request.scope["state"]["processor"]
 
 
 async def get_image_manager(request: Request) -> S3JPEGManager:
-    return request.state.image_manager
+    return request.scope["state"]["image_manager"]
 
 
 async def get_collection_name(request: Request) -> str:
-    return request.state.collection_name
+    return request.scope["state"]["collection_name"]
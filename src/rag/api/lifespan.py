@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
@@ -17,25 +18,32 @@ async def lifespan(app: FastAPI) -> AsyncIterator[State]:
 
     qdrant_client = qdrant.create_qdrant_client(settings)
 
-    # Initialize image manager using async context manager
-    async with S3JPEGManager(
-        bucket_name="rag-images",
-        endpoint_url=settings.object_storage.endpoint_url,
-        access_key_id=settings.object_storage.access_key,
-        secret_access_key=settings.object_storage.secret_access_key,
-    ) as image_manager:
-        await qdrant.create_collection(qdrant_client)
-
-        # Use context manager for proper resource cleanup
-        with ColQwen2_5Loader(model_name=settings.colpali.model_name) as loader:
-            model, processor = loader.load()
-
-            yield State(
-                model=model,
-                processor=processor,
-                qdrant_client=qdrant_client,
-                image_manager=image_manager,
-                collection_name=settings.qdrant.collection_name,
-            )
-
-    await qdrant_client.close()
+    # Use context manager for proper resource cleanup
+    with ColQwen2_5Loader(model_name=settings.colpali.model_name) as loader:
+        # Load the model in a worker thread while S3 and Qdrant are initialized
+        model_task = asyncio.create_task(asyncio.to_thread(loader.load))
+
+        try:
+            # Initialize image manager using async context manager
+            async with S3JPEGManager(
+                bucket_name="rag-images",
+                endpoint_url=settings.object_storage.endpoint_url,
+                access_key_id=settings.object_storage.access_key,
+                secret_access_key=settings.object_storage.secret_access_key,
+            ) as image_manager:
+                await qdrant.create_collection(qdrant_client)
+
+                model, processor = await model_task
+
+                yield State(
+                    model=model,
+                    processor=processor,
+                    qdrant_client=qdrant_client,
+                    image_manager=image_manager,
+                    collection_name=settings.qdrant.collection_name,
+                )
+        finally:
+            # The loader thread cannot be cancelled, wait for it before cleanup
+            await asyncio.gather(model_task, return_exceptions=True)
+
+    await qdrant.close_qdrant_client()
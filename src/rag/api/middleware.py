@@ -0,0 +1,33 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware that adds an `X-Process-Time` header to HTTP responses.
+
+    Unlike `@app.middleware("http")`, this does not wrap the app in
+    `BaseHTTPMiddleware`, so no extra tasks or `Request`/`Response` objects are
+    created and streaming responses are left untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{process_time:.6f}".encode()))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,18 +1,17 @@
+import os
 import time
-from typing import Annotated
 
-from fastapi import Depends, FastAPI, Request, Security
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from loguru import logger
 from pydantic import BaseModel
-from qdrant_client import AsyncQdrantClient
 from scalar_fastapi import get_scalar_api_reference
 
-from rag.api.dependencies import get_qdrant_client
+from rag.api.middleware import RequestTimingMiddleware
 from rag.instrumentation import instrument_app, setup_telemetry
 
-from .auth import api_key_header
+from .auth import get_user
 from .lifespan import lifespan
 
 tracer, meter = setup_telemetry()
@@ -22,34 +21,37 @@ app = FastAPI(
     description="API for Retrieval-Augmented Generation (RAG) with Qdrant",
     version="17-06-2025",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 instrument_app(app)
 
+# Comma separated list of allowed origins; set it in deployments to restrict
+# which sites may call the API with credentials instead of allowing any
+cors_origins = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=("GET", "POST", "OPTIONS"),
     allow_headers=["*"],
 )
 
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+app.add_middleware(RequestTimingMiddleware)
 
 
 # Error handling
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled error: {exc}")
-    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    logger.opt(exception=exc).error("Unhandled error")
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
 class HealthStatus(BaseModel):
@@ -57,26 +59,37 @@ class HealthStatus(BaseModel):
     timestamp: str
 
 
+# Formatted health timestamp, refreshed at most once per second
+_ts_cache: list = [0, ""]
+
+
 @app.get("/health", response_model=HealthStatus, tags=["Health"])
 async def health_check():
-    return HealthStatus(
-        status="ok",
-        timestamp=time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-    )
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[:] = [now, time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(now))]
+
+    # Returning the response directly skips the `response_model` validation
+    # pass; `HealthStatus` is only used for the OpenAPI schema.
+    return ORJSONResponse({"status": "ok", "timestamp": _ts_cache[1]})
+
+
+# Rendered Scalar page, built on first request; its inputs are fixed per process
+_scalar_html: bytes | None = None
 
 
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
-    return get_scalar_api_reference(
-        openapi_url=app.openapi_url,
-        title=app.title,
-    )
-
-
-@app.get("/")
-async def read_root(
-    qdrant_client: Annotated[AsyncQdrantClient, Depends(get_qdrant_client)],
-    api_key_header: str = Security(api_key_header),
-):
-    logger.info("Root endpoint accessed")
+    global _scalar_html
+    if _scalar_html is None:
+        _scalar_html = get_scalar_api_reference(
+            openapi_url=app.openapi_url,
+            title=app.title,
+        ).body
+    return HTMLResponse(content=_scalar_html)
+
+
+@app.get("/", dependencies=[Depends(get_user)])
+async def read_root():
+    logger.debug("Root endpoint accessed")
     return {"message": "Welcome to the RAG API!"}
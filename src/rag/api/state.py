@@ -9,6 +9,9 @@ from rag.services.image_manager import S3JPEGManager
 class State(TypedDict):
     """
     Represents the state of the RAG system.
+
+    Yielded from the lifespan; Starlette merges it into `scope["state"]` with
+    `dict.update`, so it has to stay a mapping.
     """
 
     model: ColQwen2_5
@@ -1,10 +1,12 @@
 import logging
 import os
+import traceback
+from collections.abc import Sequence
 from typing import Optional
 
 import loguru
 from opentelemetry import metrics, trace
-from opentelemetry._logs import set_logger_provider
+from opentelemetry._logs import SeverityNumber, set_logger_provider
 from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
@@ -14,13 +16,18 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler, LogRecord
 from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.semconv.attributes.http_attributes import (
     HTTP_REQUEST_METHOD,
     HTTP_RESPONSE_STATUS_CODE,
@@ -32,10 +39,81 @@ from phoenix.otel import register
 SERVICE_NAME_DEFAULT = "langgraph-rag-service"
 PHOENIX_ENDPOINT_DEFAULT = "http://localhost:6006/v1/traces"
 SIGNOZ_ENDPOINT_DEFAULT = "http://localhost:4317"
-METRIC_EXPORT_INTERVAL_MS = 5000
+METRIC_EXPORT_INTERVAL_MS = 10000
+OTEL_LOG_LEVEL_DEFAULT = "INFO"
+# Common level spellings that loguru does not know under these names
+OTEL_LOG_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+BATCH_MAX_QUEUE_SIZE = 8192
+BATCH_MAX_EXPORT_SIZE = 1024
+BATCH_SCHEDULE_DELAY_MS = 10000
+BATCH_PROCESSOR_OPTIONS = {
+    "max_queue_size": BATCH_MAX_QUEUE_SIZE,
+    "max_export_batch_size": BATCH_MAX_EXPORT_SIZE,
+    "schedule_delay_millis": BATCH_SCHEDULE_DELAY_MS,
+}
+TRACE_SAMPLE_RATIO_DEFAULT = "0.1"
+# Regexes searched in the full request URL, anchored so only these paths match
+TRACE_EXCLUDED_URLS = "/health$,/scalar$"
 
 # TODO: Move these to settings
 
+# Map loguru levels to OpenTelemetry severities
+LOGURU_SEVERITY_MAPPING = {
+    "TRACE": SeverityNumber.TRACE,
+    "DEBUG": SeverityNumber.DEBUG,
+    "INFO": SeverityNumber.INFO,
+    "SUCCESS": SeverityNumber.INFO2,
+    "WARNING": SeverityNumber.WARN,
+    "ERROR": SeverityNumber.ERROR,
+    "CRITICAL": SeverityNumber.FATAL,
+}
+
+
+class MultiSpanExporter(SpanExporter):
+    """
+    Span exporter that fans a single batch out to several exporters.
+
+    Lets one `BatchSpanProcessor` (one queue, one worker thread) feed every
+    backend instead of running a processor per exporter.
+    """
+
+    def __init__(self, exporters: Sequence[SpanExporter]):
+        self._exporters = tuple(exporters)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        result = SpanExportResult.SUCCESS
+        for exporter in self._exporters:
+            if exporter.export(spans) is not SpanExportResult.SUCCESS:
+                result = SpanExportResult.FAILURE
+        return result
+
+    def shutdown(self) -> None:
+        for exporter in self._exporters:
+            exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return all(exporter.force_flush(timeout_millis) for exporter in self._exporters)
+
+
+def get_trace_sample_ratio() -> float:
+    """
+    Read the trace sampling ratio from `OTEL_SAMPLE_RATIO`.
+
+    Invalid values, or values outside [0, 1], log a warning and fall back to
+    the default instead of failing the whole telemetry setup.
+    """
+    value = os.getenv("OTEL_SAMPLE_RATIO", TRACE_SAMPLE_RATIO_DEFAULT)
+    try:
+        ratio = float(value)
+    except ValueError:
+        ratio = None
+    if ratio is None or not 0.0 <= ratio <= 1.0:
+        logging.warning(
+            f"Invalid OTEL_SAMPLE_RATIO {value!r}, using {TRACE_SAMPLE_RATIO_DEFAULT}"
+        )
+        ratio = float(TRACE_SAMPLE_RATIO_DEFAULT)
+    return ratio
+
 
 def setup_telemetry(
     service_name: Optional[str] = None,
@@ -46,6 +124,8 @@ def setup_telemetry(
     """
     Setup OpenTelemetry instrumentation with Phoenix and SigNoz exporters.
 
+    The Phoenix exporter is opt-in and only registered when `PHOENIX_ENABLED=1`.
+
     Args:
         service_name: Name of the service for telemetry
         phoenix_endpoint: Phoenix OTLP endpoint URL
@@ -65,16 +145,21 @@ def setup_telemetry(
     )
     signoz_token = signoz_token or os.getenv("SIGNOZ_TOKEN", "<SIGNOZ_TOKEN>")
 
+    phoenix_enabled = os.getenv("PHOENIX_ENABLED") == "1"
+
     try:
-        # Phoenix setup - prevent it from setting global tracer provider
-        phoenix_tracer = register(  # noqa: F841
-            project_name=service_name,
-            endpoint=phoenix_endpoint,
-            set_global_tracer_provider=False,
-        )
+        span_exporters: list[SpanExporter] = []
+
+        if phoenix_enabled:
+            # Phoenix setup - prevent it from setting global tracer provider
+            phoenix_tracer = register(  # noqa: F841
+                project_name=service_name,
+                endpoint=phoenix_endpoint,
+                set_global_tracer_provider=False,
+            )
+            span_exporters.append(HTTPOTLPSpanExporter(endpoint=phoenix_endpoint))
 
         # Setup exporters
-        phoenix_span_exporter = HTTPOTLPSpanExporter(endpoint=phoenix_endpoint)
         signoz_headers = {"signoz-access-token": signoz_token}
 
         signoz_span_exporter = OTLPSpanExporter(
@@ -90,11 +175,15 @@ def setup_telemetry(
             headers=signoz_headers,
         )
 
-        # Configure tracing with both exporters
+        # Configure tracing with all enabled exporters
         resource = Resource.create({SERVICE_NAME: service_name})
-        tracer_provider = TracerProvider(resource=resource)
-        tracer_provider.add_span_processor(BatchSpanProcessor(phoenix_span_exporter))
-        tracer_provider.add_span_processor(BatchSpanProcessor(signoz_span_exporter))
+        sampler = ParentBased(TraceIdRatioBased(get_trace_sample_ratio()))
+        tracer_provider = TracerProvider(resource=resource, sampler=sampler)
+        span_exporters.append(signoz_span_exporter)
+        span_exporter = MultiSpanExporter(span_exporters)
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(span_exporter, **BATCH_PROCESSOR_OPTIONS)
+        )
         trace.set_tracer_provider(tracer_provider)
 
         # Configure metrics
@@ -109,7 +198,7 @@ def setup_telemetry(
         # Configure logging
         logger_provider = LoggerProvider(resource=resource)
         logger_provider.add_log_record_processor(
-            BatchLogRecordProcessor(signoz_log_exporter)
+            BatchLogRecordProcessor(signoz_log_exporter, **BATCH_PROCESSOR_OPTIONS)
         )
         set_logger_provider(logger_provider)
 
@@ -119,7 +208,7 @@ def setup_telemetry(
         logging.getLogger().setLevel(logging.DEBUG)
 
         # Setup loguru integration
-        setup_loguru_integration(handler)
+        setup_loguru_integration(logger_provider)
 
         return trace.get_tracer(__name__), metrics.get_meter(__name__)
 
@@ -129,54 +218,68 @@ def setup_telemetry(
         return trace.NoOpTracer(), metrics.NoOpMeter(__name__)
 
 
-def setup_loguru_integration(otel_handler: LoggingHandler) -> None:
+def setup_loguru_integration(logger_provider: LoggerProvider) -> None:
     """
     Setup loguru to send logs to OpenTelemetry.
 
+    Records are emitted directly through the OpenTelemetry Logger API, without
+    building an intermediate `logging.LogRecord` and going through the
+    stdlib handler chain.
+
     Args:
-        otel_handler: OpenTelemetry logging handler
+        logger_provider: OpenTelemetry logger provider
     """
+    otel_logger = logger_provider.get_logger(__name__)
 
     def otel_sink(message):
-        """Custom sink that forwards loguru messages to OTEL handler"""
+        """Custom sink that forwards loguru messages to the OTEL logger"""
         record = message.record
         level_name = record["level"].name
-        log_message = record["message"]
-
-        # Map loguru levels to standard logging levels
-        level_mapping = {
-            "TRACE": logging.DEBUG,
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "SUCCESS": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL,
-        }
+        severity_number = LOGURU_SEVERITY_MAPPING.get(level_name, SeverityNumber.INFO)
 
-        # Create a standard library LogRecord
-        level = level_mapping.get(level_name, logging.INFO)
-        log_record = logging.LogRecord(
-            name=record["name"],
-            level=level,
-            pathname=record["file"].path,
-            lineno=record["line"],
-            msg=log_message,
-            args=(),
-            exc_info=record["exception"],
-        )
+        attributes = {
+            "code.namespace": record["name"] or "",
+            "code.filepath": record["file"].path,
+            "code.function": record["function"],
+            "code.lineno": record["line"],
+        }
+        exception = record["exception"]
+        if exception is not None and exception.type is not None:
+            attributes["exception.type"] = exception.type.__name__
+            attributes["exception.message"] = str(exception.value)
+            attributes["exception.stacktrace"] = "".join(
+                traceback.format_exception(*exception)
+            )
 
         # Add trace context for correlation
-        current_span = trace.get_current_span()
-        if current_span and current_span.is_recording():
-            span_context = current_span.get_span_context()
-            log_record.otelTraceID = format(span_context.trace_id, "032x")
-            log_record.otelSpanID = format(span_context.span_id, "016x")
-
-        otel_handler.emit(log_record)
+        span_context = trace.get_current_span().get_span_context()
+
+        otel_logger.emit(
+            LogRecord(
+                timestamp=int(record["time"].timestamp() * 1e9),
+                trace_id=span_context.trace_id,
+                span_id=span_context.span_id,
+                trace_flags=span_context.trace_flags,
+                severity_text=level_name,
+                severity_number=severity_number,
+                body=record["message"],
+                attributes=attributes,
+                resource=logger_provider.resource,
+            )
+        )
 
-    # Add the OTEL sink to loguru
-    loguru.logger.add(otel_sink, level="TRACE", serialize=False)
+    # Add the OTEL sink to loguru; loguru drops records below `level` before
+    # the sink is called, so debug/trace lines never reach the OTEL pipeline
+    level = os.getenv("OTEL_LOG_LEVEL", OTEL_LOG_LEVEL_DEFAULT).strip().upper()
+    level = OTEL_LOG_LEVEL_ALIASES.get(level, level)
+    try:
+        loguru.logger.level(level)
+    except ValueError:
+        logging.warning(
+            f"Unknown OTEL_LOG_LEVEL {level!r}, using {OTEL_LOG_LEVEL_DEFAULT}"
+        )
+        level = OTEL_LOG_LEVEL_DEFAULT
+    loguru.logger.add(otel_sink, level=level, serialize=False)
 
 
 def instrument_app(app):
@@ -271,6 +374,7 @@ def instrument_app(app):
         # Instrument FastAPI with custom hooks
         FastAPIInstrumentor.instrument_app(
             app,
+            excluded_urls=TRACE_EXCLUDED_URLS,
             server_request_hook=fastapi_request_hook,
             client_request_hook=fastapi_response_hook,
         )
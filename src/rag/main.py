@@ -1,3 +1,6 @@
+import os
+
+import uvicorn
 from typer import Typer
 
 from .settings import get_settings
@@ -15,7 +18,13 @@ def start():
     settings = get_settings()
     print("Starting RAG server with settings:")
     print(settings.model_dump())
-    print("Hello from rag!")
+    uvicorn.run(
+        "rag.api.server:app",
+        loop="auto",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        lifespan="on",
+    )
 
 
 def callback():
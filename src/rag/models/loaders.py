@@ -11,6 +11,10 @@ class ColQwen2_5Loader:
     """
 
     def __init__(self, model_name: str = "vidore/colqwen2.5-v0.2"):
+        # Must run before the CUDA probes below initialize CUDA, or the allocator
+        # and debug settings it exports are never read
+        setup_multiprocessing()
+
         self.model_name = model_name
         self._device = (
             "cuda"
@@ -46,8 +50,8 @@ class ColQwen2_5Loader:
             del self._processor
             self._processor = None
 
-        # Use the utility function for cleanup
-        cleanup_torch_resources()
+        # The model weights were just released, hand their memory back to CUDA
+        cleanup_torch_resources(force_empty_cache=True)
 
     def load(self):
         """
@@ -60,6 +64,9 @@ class ColQwen2_5Loader:
             torch.backends.cuda.matmul.allow_tf32 = True
             torch.backends.cudnn.allow_tf32 = True
 
+        if torch.cuda.is_available():
+            torch.set_float32_matmul_precision("high")
+
         self._model = self.load_model()
         self._processor = self.load_processor()
         return self._model, self._processor
@@ -71,6 +78,11 @@ class ColQwen2_5Loader:
             torch_dtype=self._dtype,
             attn_implementation=self._attn_implementation,
         ).eval()
+
+        # Compile once at load time; inference runs many times per process.
+        # Callers should run forward passes under `torch.inference_mode()`.
+        if torch.cuda.is_available():
+            model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
         return model
 
     def load_processor(self) -> ColQwen2_5_Processor:
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import Field
+from pydantic.dataclasses import dataclass
 
 
-class Reference(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Reference:
     id: int = Field(
         description="Sequential numeric identifier for the reference, starting from 1, used for citations in the answer"
     )
@@ -9,7 +11,8 @@ class Reference(BaseModel):
     filename: str
 
 
-class FinalResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class FinalResponse:
     references: list[Reference] = Field(
         description="List of unique reference entries indicating where the supporting information was found."
     )
@@ -1,15 +1,47 @@
 import asyncio
-from contextlib import asynccontextmanager
+import posixpath
+import random
+import threading
+from collections.abc import AsyncIterator
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import (
+    ClientError,
+    EndpointConnectionError,
+    NoCredentialsError,
+)
 from loguru import logger
 from PIL import Image
 from pydantic import UUID4
 
+# S3 error codes worth retrying: throttling and transient server-side failures
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "SlowDown",
+        "RequestTimeout",
+        "InternalError",
+        "ServiceUnavailable",
+        "500",
+        "503",
+    }
+)
+# Error codes S3 (and S3-compatible stores) use for a missing key
+MISSING_ERROR_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 10.0
+# Maximum number of keys S3 returns per listing request
+LIST_MAX_KEYS = 1000
+# S3 requires every part but the last to be at least 5 MiB
+MIN_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+# Colour transparent pixels are flattened onto before JPEG encoding
+JPEG_BACKGROUND = (255, 255, 255)
+# Maximum number of idle RGB canvases a manager keeps for flattening RGBA pages
+CANVAS_POOL_SIZE = 4
+
 
 class S3ImageError(Exception):
     """Base exception for S3 image operations."""
@@ -35,6 +67,130 @@ class S3ImageDownloadError(S3ImageError):
     pass
 
 
+class _CanvasPool:
+    """
+    Bounded pool of RGB canvases reused for flattening RGBA images.
+
+    Encoding runs in worker threads, so access is guarded by a lock. At most
+    `max_size` idle canvases are kept, and `clear` releases all of them.
+    """
+
+    def __init__(self, max_size: int = CANVAS_POOL_SIZE):
+        self.max_size = max_size
+        self._canvases: List[Image.Image] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: Tuple[int, int]) -> Image.Image:
+        """Take a blank canvas of `size`, reusing an idle one when possible."""
+        canvas = None
+        with self._lock:
+            for index, idle in enumerate(self._canvases):
+                if idle.size == size:
+                    canvas = self._canvases.pop(index)
+                    break
+        if canvas is None:
+            return Image.new("RGB", size, JPEG_BACKGROUND)
+        canvas.paste(JPEG_BACKGROUND, (0, 0, *size))
+        return canvas
+
+    def release(self, canvas: Image.Image):
+        """Return a canvas to the pool, dropping it if the pool is full."""
+        with self._lock:
+            if len(self._canvases) < self.max_size:
+                self._canvases.append(canvas)
+
+    def clear(self):
+        """Drop every idle canvas."""
+        with self._lock:
+            self._canvases.clear()
+
+
+def _open_draft(
+    image: Image.Image, target_size: Tuple[int, int]
+) -> Optional[Image.Image]:
+    """
+    Reopen a JPEG source as a separate image decoded at a reduced scale.
+
+    `Image.draft` reconfigures the decoder of the image it is called on, so it
+    is applied to a fresh handle on the same file or in-memory data instead of
+    the caller's image. Returns None when the source cannot be reopened.
+    """
+    if image.format != "JPEG":
+        return None
+    if getattr(image, "filename", None):
+        draft = Image.open(image.filename)
+    elif isinstance(getattr(image, "fp", None), BytesIO):
+        draft = Image.open(BytesIO(image.fp.getvalue()))
+    else:
+        return None
+    draft.draft("RGB", target_size)
+    return draft
+
+
+def _encode_jpeg(
+    image: Image.Image,
+    quality: int,
+    optimize: bool = False,
+    target_size: Optional[Tuple[int, int]] = None,
+    canvas_pool: Optional[_CanvasPool] = None,
+) -> bytes:
+    """
+    Encode a PIL Image as JPEG bytes.
+
+    Synchronous and CPU-bound; meant to be run with `asyncio.to_thread`.
+
+    If `target_size` is given and the image is a JPEG backed by a file or
+    in-memory data, a separate copy is decoded at the smallest 1/2, 1/4 or 1/8
+    scale still covering that size; `image` itself is never modified. Images
+    with transparency are flattened onto a white canvas, taken from
+    `canvas_pool` when given.
+    """
+    draft = _open_draft(image, target_size) if target_size is not None else None
+    try:
+        return _encode_rgb_jpeg(draft or image, quality, optimize, canvas_pool)
+    finally:
+        if draft is not None:
+            draft.close()
+
+
+def _encode_rgb_jpeg(
+    image: Image.Image,
+    quality: int,
+    optimize: bool,
+    canvas_pool: Optional[_CanvasPool],
+) -> bytes:
+    """Convert `image` to RGB where needed and encode it as JPEG bytes."""
+    # Every mode with transparency is flattened the same way, onto white
+    if image.mode in ("LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        image = image.convert("RGBA")
+
+    canvas = None
+    if image.mode == "RGBA":
+        if canvas_pool is not None:
+            canvas = canvas_pool.acquire(image.size)
+        else:
+            canvas = Image.new("RGB", image.size, JPEG_BACKGROUND)
+        # An RGBA mask is read through its alpha band, no separate band is extracted
+        canvas.paste(image, mask=image)
+        image = canvas
+    # Convert to RGB if necessary (for JPEG compatibility)
+    elif image.mode == "P":
+        logger.debug(
+            "Converting image from {} to RGB for JPEG compatibility", image.mode
+        )
+        image = image.convert("RGB")
+
+    try:
+        with BytesIO() as buffer:
+            image.save(buffer, format="JPEG", quality=quality, optimize=optimize)
+            return buffer.getvalue()
+    finally:
+        if canvas is not None and canvas_pool is not None:
+            canvas_pool.release(canvas)
+
+
 class S3JPEGManager:
     """
     Asynchronous S3 manager for handling JPEG image uploads and downloads.
@@ -43,12 +199,15 @@ class S3JPEGManager:
     images from S3 as bytes or instructor.Image objects. All operations are performed
     asynchronously for better performance.
 
-    Supports context manager usage for automatic resource cleanup.
+    All operations share a single long-lived S3 client so connections are reused
+    across requests. Use the manager as an async context manager (or call
+    `close()`) to release it.
 
     Attributes:
         bucket_name (str): The S3 bucket name to operate on
         session: Aiobotocore session for S3 operations
         config (dict): AWS configuration including credentials and region
+        client_config (AioConfig): Client configuration, sized for max_concurrency
     """
 
     def __init__(
@@ -59,7 +218,11 @@ class S3JPEGManager:
         region_name: str = "us-east-1",
         endpoint_url: Optional[str] = None,
         jpeg_quality: int = 95,
+        jpeg_optimize: bool = False,
         max_retries: int = 3,
+        max_concurrency: int = 32,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
     ):
         """
         Initialize the S3JPEGManager.
@@ -71,7 +234,15 @@ class S3JPEGManager:
             region_name (str): AWS region name. Defaults to "us-east-1"
             endpoint_url (Optional[str]): Custom S3 endpoint URL for S3-compatible services
             jpeg_quality (int): JPEG compression quality (1-100). Defaults to 95
+            jpeg_optimize (bool): Run the extra Huffman optimization pass when encoding,
+                trading encode CPU for slightly smaller files. Defaults to False
             max_retries (int): Maximum number of retry attempts for failed operations. Defaults to 3
+            max_concurrency (int): Maximum number of in-flight S3 requests for batch operations,
+                also used as the client connection pool size. Defaults to 32
+            multipart_threshold (int): Encoded size in bytes above which images are
+                uploaded as multipart uploads. Defaults to 8 MiB
+            multipart_chunksize (int): Size in bytes of each multipart part, at least
+                5 MiB. Defaults to 8 MiB
 
         Raises:
             ValueError: If bucket_name is empty or jpeg_quality is out of range
@@ -82,10 +253,18 @@ class S3JPEGManager:
             raise ValueError("jpeg_quality must be between 1 and 100")
         if max_retries < 0:
             raise ValueError("max_retries must be non-negative")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if multipart_chunksize < MIN_MULTIPART_CHUNKSIZE:
+            raise ValueError("multipart_chunksize must be at least 5 MiB")
 
         self.bucket_name = bucket_name.strip()
         self.jpeg_quality = jpeg_quality
+        self.jpeg_optimize = jpeg_optimize
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunksize = multipart_chunksize
         self.session = get_session()
         self.config = {
             "region_name": region_name,
@@ -95,8 +274,15 @@ class S3JPEGManager:
         }
         # Remove None values
         self.config = {k: v for k, v in self.config.items() if v is not None}
+        # Size the connection pool to the number of concurrent requests
+        self.client_config = AioConfig(max_pool_connections=max_concurrency)
+        # Semaphores bind to the running loop on first use, not on creation
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         self._client = None
         self._client_context = None
+        self._client_lock = asyncio.Lock()
+        # Canvases for flattening RGBA pages, released after each upload call
+        self._canvas_pool = _CanvasPool()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -110,22 +296,37 @@ class S3JPEGManager:
         await self.close()
 
     async def _ensure_client(self):
-        """Ensure S3 client is created and available."""
-        if self._client is None:
-            try:
-                logger.debug("Creating S3 client with bucket: {}", self.bucket_name)
-                client_context = self.session.create_client("s3", **self.config)
-                self._client = await client_context.__aenter__()
-                self._client_context = client_context
-                logger.info(
-                    "S3 client created successfully for bucket: {}", self.bucket_name
-                )
-            except NoCredentialsError as e:
-                logger.error("AWS credentials not found: {}", e)
-                raise S3ImageError(f"AWS credentials not found: {e}")
+        """
+        Ensure the shared S3 client is created and return it.
+
+        The client is created once and reused by every operation until
+        `close()` is called.
+        """
+        if self._client is not None:
+            return self._client
+
+        # Concurrent first calls must not each create their own client
+        async with self._client_lock:
+            if self._client is None:
+                try:
+                    logger.debug("Creating S3 client with bucket: {}", self.bucket_name)
+                    client_context = self.session.create_client(
+                        "s3", config=self.client_config, **self.config
+                    )
+                    self._client = await client_context.__aenter__()
+                    self._client_context = client_context
+                    logger.info(
+                        "S3 client created successfully for bucket: {}",
+                        self.bucket_name,
+                    )
+                except NoCredentialsError as e:
+                    logger.error("AWS credentials not found: {}", e)
+                    raise S3ImageError(f"AWS credentials not found: {e}")
+        return self._client
 
     async def close(self):
         """Close the S3 client and clean up resources."""
+        self._canvas_pool.clear()
         if hasattr(self, "_client_context") and self._client_context:
             logger.debug("Closing S3 client")
             await self._client_context.__aexit__(None, None, None)
@@ -133,32 +334,51 @@ class S3JPEGManager:
             self._client_context = None
             logger.debug("S3 client closed successfully")
 
-    @asynccontextmanager
-    async def _get_client(self):
-        """Get S3 client as context manager."""
-        if self._client:
-            yield self._client
-        else:
-            async with self.session.create_client("s3", **self.config) as client:
-                yield client
+    @staticmethod
+    def _is_retryable(exc: BaseException) -> bool:
+        """Check whether an error is transient (throttling, 5xx or connection)."""
+        # Our own errors wrap the underlying botocore error as their cause
+        if isinstance(exc, S3ImageError) and exc.__cause__ is not None:
+            exc = exc.__cause__
+        if isinstance(exc, (asyncio.TimeoutError, EndpointConnectionError)):
+            return True
+        if isinstance(exc, ClientError):
+            error_code = exc.response.get("Error", {}).get("Code")
+            status_code = exc.response.get("ResponseMetadata", {}).get(
+                "HTTPStatusCode", 0
+            )
+            return error_code in RETRYABLE_ERROR_CODES or status_code >= 500
+        return False
+
+    @staticmethod
+    def _is_missing(exc: ClientError) -> bool:
+        """Check whether a client error means the requested key does not exist."""
+        error_code = exc.response.get("Error", {}).get("Code")
+        status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return error_code in MISSING_ERROR_CODES or status_code == 404
 
     async def _retry_operation(self, operation, *args, **kwargs):
-        """Retry an operation with exponential backoff."""
-        last_exception = None
+        """
+        Retry an operation on transient errors with full-jitter exponential backoff.
+
+        Non-retryable errors are raised immediately.
+        """
         for attempt in range(self.max_retries + 1):
             try:
                 return await operation(*args, **kwargs)
             except Exception as e:
-                last_exception = e
-                if attempt < self.max_retries:
-                    wait_time = 2**attempt
-                    logger.warning(
-                        f"Operation failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}"
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    break
-        raise last_exception
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                wait_time = random.uniform(
+                    0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+                )
+                logger.warning(
+                    "Operation failed (attempt {}), retrying in {:.2f}s: {}",
+                    attempt + 1,
+                    wait_time,
+                    e,
+                )
+                await asyncio.sleep(wait_time)
 
     # Download methods
     async def download_image(self, filename: str) -> bytes:
@@ -179,41 +399,122 @@ class S3JPEGManager:
             raise ValueError("filename cannot be empty")
 
         async def _download():
-            async with self._get_client() as s3_client:
-                try:
-                    logger.debug("Downloading image: {}", filename.strip())
-                    response = await s3_client.get_object(
-                        Bucket=self.bucket_name, Key=filename.strip()
-                    )
-                    image_data = await response["Body"].read()
-                    logger.info(
-                        "Successfully downloaded image: {} ({} bytes)",
-                        filename.strip(),
-                        len(image_data),
-                    )
-                    return image_data
-                except ClientError as e:
-                    error_code = e.response["Error"]["Code"]
-                    if error_code == "NoSuchKey":
-                        logger.warning("Image not found in S3: {}", filename)
-                        raise S3ImageNotFoundError(f"Image not found: {filename}")
-                    else:
-                        logger.error("Failed to download image {}: {}", filename, e)
-                        raise S3ImageDownloadError(
-                            f"Failed to download {filename}: {e}"
-                        )
+            s3_client = await self._ensure_client()
+            try:
+                logger.debug("Downloading image: {}", filename.strip())
+                response = await s3_client.get_object(
+                    Bucket=self.bucket_name, Key=filename.strip()
+                )
+                image_data = await response["Body"].read()
+                logger.info(
+                    "Successfully downloaded image: {} ({} bytes)",
+                    filename.strip(),
+                    len(image_data),
+                )
+                return image_data
+            except ClientError as e:
+                if self._is_missing(e):
+                    logger.warning("Image not found in S3: {}", filename)
+                    raise S3ImageNotFoundError(f"Image not found: {filename}") from e
+                else:
+                    logger.error("Failed to download image {}: {}", filename, e)
+                    raise S3ImageDownloadError(
+                        f"Failed to download {filename}: {e}"
+                    ) from e
 
         return await self._retry_operation(_download)
 
+    async def stream_image(
+        self, filename: str, chunk_size: int = 1 << 16
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a single image from S3 in chunks.
+
+        Unlike `download_image`, the object body is never buffered in full, so only
+        one chunk per download is held in memory at a time.
+
+        Args:
+            filename (str): The S3 key/filename of the image to stream
+            chunk_size (int): Size in bytes of each yielded chunk. Defaults to 64 KiB
+
+        Yields:
+            bytes: Consecutive chunks of the raw image data
+
+        Raises:
+            S3ImageNotFoundError: If the image doesn't exist
+            S3ImageDownloadError: If download fails for other reasons
+        """
+        if not filename or not filename.strip():
+            raise ValueError("filename cannot be empty")
+
+        key = filename.strip()
+        s3_client = await self._ensure_client()
+        try:
+            logger.debug("Streaming image: {}", key)
+            response = await self._retry_operation(
+                s3_client.get_object, Bucket=self.bucket_name, Key=key
+            )
+        except ClientError as e:
+            if self._is_missing(e):
+                logger.warning("Image not found in S3: {}", key)
+                raise S3ImageNotFoundError(f"Image not found: {key}") from e
+            logger.error("Failed to stream image {}: {}", key, e)
+            raise S3ImageDownloadError(f"Failed to stream {key}: {e}") from e
+
+        body = response["Body"]
+        try:
+            async for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def _find_missing(self, paths: List[str]) -> set[str]:
+        """
+        Find which of the given keys do not exist in S3.
+
+        Keys sharing a common prefix are checked with a single listing; otherwise
+        each key is checked with a bounded-concurrency HEAD request.
+
+        Args:
+            paths (List[str]): List of S3 keys to check
+
+        Returns:
+            set[str]: The (stripped) keys that do not exist
+        """
+        keys = [path.strip() for path in paths]
+
+        prefix = posixpath.commonprefix(keys)
+        prefix = prefix[: prefix.rfind("/") + 1]
+        if prefix:
+            listed = await self.list_images(prefix=prefix, max_keys=LIST_MAX_KEYS)
+            # A full page means the listing may be truncated; fall back to HEADs
+            if len(listed) < LIST_MAX_KEYS:
+                existing = set(listed)
+                return {key for key in keys if key not in existing}
+
+        async def _bounded_exists(key: str) -> bool:
+            async with self._semaphore:
+                return await self.image_exists(key)
+
+        exists = await asyncio.gather(*[_bounded_exists(key) for key in keys])
+        return {key for key, found in zip(keys, exists) if not found}
+
     async def download_images(
-        self, paths: List[str], ignore_missing: bool = False
+        self,
+        paths: List[str],
+        ignore_missing: bool = False,
+        prefetch_check: bool = False,
     ) -> List[Optional[bytes]]:
         """
         Download multiple images from S3 concurrently.
 
+        At most `max_concurrency` downloads are in flight at once.
+
         Args:
             paths (List[str]): List of S3 keys/filenames to download
             ignore_missing (bool): If True, return None for missing images instead of raising error
+            prefetch_check (bool): If True (and ignore_missing is True), check which images
+                exist up front and only GET those, instead of paying a failed GET per miss
 
         Returns:
             List[Optional[bytes]]: List of raw image data as bytes or None for missing images
@@ -227,17 +528,41 @@ class S3JPEGManager:
 
         logger.info("Starting batch download of {} images", len(paths))
 
-        async def _safe_download(path: str) -> Optional[bytes]:
+        missing: set[str] = set()
+        if prefetch_check and ignore_missing:
+            missing = await self._find_missing(paths)
+            logger.debug("Skipping {} missing images", len(missing))
+
+        async def _safe_download(index: int, path: str) -> tuple[int, Optional[bytes]]:
+            if path.strip() in missing:
+                return index, None
             try:
-                return await self.download_image(path)
+                async with self._semaphore:
+                    return index, await self.download_image(path)
             except S3ImageNotFoundError:
                 if ignore_missing:
                     logger.warning(f"Image not found, skipping: {path}")
-                    return None
+                    return index, None
                 raise
 
-        tasks = [_safe_download(path) for path in paths]
-        results = await asyncio.gather(*tasks)
+        # Results are written back by index as downloads finish, and finished
+        # tasks are dropped right away so their memory can be reclaimed
+        results: List[Optional[bytes]] = [None] * len(paths)
+        tasks: List[Optional[asyncio.Task]] = [
+            asyncio.create_task(_safe_download(index, path))
+            for index, path in enumerate(paths)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, data = await next_done
+                results[index] = data
+                tasks[index] = None
+        except BaseException:
+            for task in tasks:
+                if task is not None:
+                    task.cancel()
+            raise
+
         successful_downloads = sum(1 for result in results if result is not None)
         logger.info(
             "Batch download completed: {}/{} images downloaded successfully",
@@ -277,7 +602,11 @@ class S3JPEGManager:
 
     # Upload methods
     async def _upload_image(
-        self, key: str, image: Image.Image, metadata: Optional[Dict[str, str]] = None
+        self,
+        key: str,
+        image: Image.Image,
+        metadata: Optional[Dict[str, str]] = None,
+        target_size: Optional[Tuple[int, int]] = None,
     ):
         """
         Internal method to upload a single PIL Image to S3 as JPEG.
@@ -286,59 +615,131 @@ class S3JPEGManager:
             key (str): S3 key for the image
             image (Image.Image): PIL Image object to upload
             metadata (Optional[Dict[str, str]]): Optional metadata to attach to the object
+            target_size (Optional[Tuple[int, int]]): Resolution needed downstream;
+                lets JPEG sources be decoded at a reduced scale. The given
+                image objects are not modified
 
         Raises:
             S3ImageUploadError: If upload fails
         """
+        try:
+            # Encoding is CPU-bound; run it in a worker thread so other uploads
+            # and downloads keep progressing on the event loop
+            data = await asyncio.to_thread(
+                _encode_jpeg,
+                image,
+                self.jpeg_quality,
+                self.jpeg_optimize,
+                target_size,
+                self._canvas_pool,
+            )
+        except Exception as e:
+            logger.error("Failed to encode image for {}: {}", key, e)
+            raise S3ImageUploadError(f"Failed to encode image for {key}: {e}") from e
 
         async def _upload():
-            async with self._get_client() as s3_client:
-                try:
-                    logger.debug("Uploading image to S3 key: {}", key)
-                    with BytesIO() as buffer:
-                        # Convert to RGB if necessary (for JPEG compatibility)
-                        if image.mode in ("RGBA", "LA", "P"):
-                            logger.debug(
-                                "Converting image from {} to RGB for JPEG compatibility",
-                                image.mode,
-                            )
-                            converted_image = image.convert("RGB")
-                        else:
-                            converted_image = image
-
-                        converted_image.save(
-                            buffer,
-                            format="JPEG",
-                            quality=self.jpeg_quality,
-                            optimize=True,
-                        )
-                        buffer.seek(0)
-                        image_size = len(buffer.getvalue())
-
-                        put_args = {
-                            "Bucket": self.bucket_name,
-                            "Key": key,
-                            "Body": buffer.getvalue(),
-                            "ContentType": "image/jpeg",
-                        }
-
-                        if metadata:
-                            put_args["Metadata"] = metadata
-                            logger.debug("Adding metadata to upload: {}", metadata)
-
-                        await s3_client.put_object(**put_args)
-                        logger.info(
-                            "Successfully uploaded image to {} ({} bytes, quality: {})",
-                            key,
-                            image_size,
-                            self.jpeg_quality,
-                        )
-                except Exception as e:
-                    logger.error("Failed to upload image to {}: {}", key, e)
-                    raise S3ImageUploadError(f"Failed to upload image to {key}: {e}")
+            s3_client = await self._ensure_client()
+            try:
+                logger.debug("Uploading image to S3 key: {}", key)
+                if len(data) > self.multipart_threshold:
+                    await self._multipart_upload(s3_client, key, data, metadata)
+                else:
+                    put_args = {
+                        "Bucket": self.bucket_name,
+                        "Key": key,
+                        "Body": data,
+                        "ContentType": "image/jpeg",
+                    }
+
+                    if metadata:
+                        put_args["Metadata"] = metadata
+                        logger.debug("Adding metadata to upload: {}", metadata)
+
+                    await s3_client.put_object(**put_args)
+                logger.info(
+                    "Successfully uploaded image to {} ({} bytes, quality: {})",
+                    key,
+                    len(data),
+                    self.jpeg_quality,
+                )
+            except Exception as e:
+                logger.error("Failed to upload image to {}: {}", key, e)
+                raise S3ImageUploadError(f"Failed to upload image to {key}: {e}") from e
 
         await self._retry_operation(_upload)
 
+    async def _multipart_upload(
+        self,
+        s3_client,
+        key: str,
+        data: bytes,
+        metadata: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Internal method to upload large encoded images as a multipart upload.
+
+        Parts are uploaded concurrently and the upload is aborted on failure so no
+        orphaned parts are left in the bucket.
+
+        Args:
+            s3_client: S3 client to use
+            key (str): S3 key for the image
+            data (bytes): Encoded JPEG data
+            metadata (Optional[Dict[str, str]]): Optional metadata to attach to the object
+        """
+        create_args = {
+            "Bucket": self.bucket_name,
+            "Key": key,
+            "ContentType": "image/jpeg",
+        }
+        if metadata:
+            create_args["Metadata"] = metadata
+
+        upload = await s3_client.create_multipart_upload(**create_args)
+        upload_id = upload["UploadId"]
+        logger.debug("Started multipart upload {} for key: {}", upload_id, key)
+
+        async def _upload_part(part_number: int, offset: int) -> dict:
+            response = await s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data[offset : offset + self.multipart_chunksize],
+            )
+            return {"ETag": response["ETag"], "PartNumber": part_number}
+
+        try:
+            parts = await asyncio.gather(
+                *[
+                    _upload_part(part_number, offset)
+                    for part_number, offset in enumerate(
+                        range(0, len(data), self.multipart_chunksize), start=1
+                    )
+                ]
+            )
+            await s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            logger.warning("Aborting multipart upload {} for key: {}", upload_id, key)
+            try:
+                await s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=key, UploadId=upload_id
+                )
+            except Exception as abort_error:
+                # Keep the upload failure as the raised error, it decides retries
+                logger.error(
+                    "Failed to abort multipart upload {} for key {}: {}",
+                    upload_id,
+                    key,
+                    abort_error,
+                )
+            raise
+
     async def upload_images(
         self,
         session_id: UUID4,
@@ -346,16 +747,22 @@ class S3JPEGManager:
         images: List[Image.Image],
         start: int = 1,
         metadata: Optional[Dict[str, str]] = None,
+        target_size: Optional[Tuple[int, int]] = None,
     ) -> List[str]:
         """
         Upload multiple PIL Images to S3 concurrently as JPEG files.
 
+        At most `max_concurrency` uploads are in flight at once.
+
         Args:
             session_id (UUID4): Unique session identifier for organizing uploads
             file_name (str): Name of the file/document the images belong to
             images (List[Image.Image]): List of PIL Image objects to upload
             start (int): Starting page number for the images. Defaults to 1
             metadata (Optional[Dict[str, str]]): Optional metadata to attach to all images
+            target_size (Optional[Tuple[int, int]]): Resolution needed downstream;
+                lets JPEG sources be decoded at a reduced scale. The given
+                image objects are not modified
 
         Returns:
             List[str]: List of S3 keys for the uploaded images
@@ -368,7 +775,8 @@ class S3JPEGManager:
             logger.warning("No images to upload")
             return []
 
-        if not file_name or not file_name.strip():
+        file_name = file_name.strip() if file_name else ""
+        if not file_name:
             raise ValueError("file_name cannot be empty")
 
         logger.info(
@@ -378,18 +786,23 @@ class S3JPEGManager:
             s=session_id,
         )
 
-        keys = [
-            f"{session_id}/{file_name.strip()}/{page}.jpeg"
-            for page in range(start, start + len(images))
-        ]
+        prefix = f"{session_id}/{file_name}/"
+        keys = [f"{prefix}{page}.jpeg" for page in range(start, start + len(images))]
 
-        tasks = [
-            self._upload_image(key=key, image=image, metadata=metadata)
-            for key, image in zip(keys, images)
-        ]
+        async def _bounded_upload(key: str, image: Image.Image):
+            async with self._semaphore:
+                await self._upload_image(
+                    key=key, image=image, metadata=metadata, target_size=target_size
+                )
+
+        tasks = [_bounded_upload(key, image) for key, image in zip(keys, images)]
 
         logger.debug("Starting concurrent upload of {} images", len(tasks))
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Don't keep full-page canvases alive between batches
+            self._canvas_pool.clear()
         logger.success("Uploaded {n} images", n=len(images))
         return keys
 
@@ -414,7 +827,8 @@ class S3JPEGManager:
             S3ImageUploadError: If upload fails
             ValueError: If image format is not supported
         """
-        if not key or not key.strip():
+        key = key.strip() if key else ""
+        if not key:
             raise ValueError("key cannot be empty")
 
         # Convert input to PIL Image
@@ -431,9 +845,9 @@ class S3JPEGManager:
             logger.error("Unsupported image type: {}", type(image))
             raise ValueError(f"Unsupported image type: {type(image)}")
 
-        await self._upload_image(key=key.strip(), image=pil_image, metadata=metadata)
-        logger.info("Single image uploaded successfully to key: {}", key.strip())
-        return key.strip()
+        await self._upload_image(key=key, image=pil_image, metadata=metadata)
+        logger.info("Single image uploaded successfully to key: {}", key)
+        return key
 
     # Utility methods
     async def image_exists(self, key: str) -> bool:
@@ -447,13 +861,15 @@ class S3JPEGManager:
             bool: True if the image exists, False otherwise
         """
         try:
-            async with self._get_client() as s3_client:
-                logger.debug("Checking if image exists: {}", key)
-                await s3_client.head_object(Bucket=self.bucket_name, Key=key)
-                logger.debug("Image exists: {}", key)
-                return True
+            s3_client = await self._ensure_client()
+            logger.debug("Checking if image exists: {}", key)
+            await self._retry_operation(
+                s3_client.head_object, Bucket=self.bucket_name, Key=key
+            )
+            logger.debug("Image exists: {}", key)
+            return True
         except ClientError as e:
-            if e.response["Error"]["Code"] == "404":
+            if self._is_missing(e):
                 logger.debug("Image does not exist: {}", key)
                 return False
             logger.error("Failed to check if image exists {}: {}", key, e)
@@ -473,20 +889,23 @@ class S3JPEGManager:
             S3ImageError: If deletion fails
         """
         try:
-            async with self._get_client() as s3_client:
-                logger.debug("Deleting image: {}", key)
-                await s3_client.delete_object(Bucket=self.bucket_name, Key=key)
-                logger.info("Successfully deleted image: {}", key)
-                return True
+            s3_client = await self._ensure_client()
+            logger.debug("Deleting image: {}", key)
+            await self._retry_operation(
+                s3_client.delete_object, Bucket=self.bucket_name, Key=key
+            )
+            logger.info("Successfully deleted image: {}", key)
+            return True
         except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "NoSuchKey":
+            if self._is_missing(e):
                 logger.warning("Attempted to delete non-existent image: {}", key)
                 return False
             logger.error("Failed to delete image {}: {}", key, e)
             raise S3ImageError(f"Failed to delete image {key}: {e}")
 
-    async def list_images(self, prefix: str = "", max_keys: int = 1000) -> List[str]:
+    async def list_images(
+        self, prefix: str = "", max_keys: int = LIST_MAX_KEYS
+    ) -> List[str]:
         """
         List images in the bucket with optional prefix filtering.
 
@@ -498,16 +917,16 @@ class S3JPEGManager:
             List[str]: List of S3 keys matching the criteria
         """
         try:
-            async with self._get_client() as s3_client:
-                logger.debug(
-                    "Listing images with prefix: '{}', max_keys: {}", prefix, max_keys
-                )
-                response = await s3_client.list_objects_v2(
-                    Bucket=self.bucket_name, Prefix=prefix, MaxKeys=max_keys
-                )
-                keys = [obj["Key"] for obj in response.get("Contents", [])]
-                logger.info("Found {} images with prefix '{}'", len(keys), prefix)
-                return keys
+            s3_client = await self._ensure_client()
+            logger.debug(
+                "Listing images with prefix: '{}', max_keys: {}", prefix, max_keys
+            )
+            response = await s3_client.list_objects_v2(
+                Bucket=self.bucket_name, Prefix=prefix, MaxKeys=max_keys
+            )
+            keys = [obj["Key"] for obj in response.get("Contents", [])]
+            logger.info("Found {} images with prefix '{}'", len(keys), prefix)
+            return keys
         except ClientError as e:
             logger.error("Failed to list images with prefix '{}': {}", prefix, e)
             raise S3ImageError(f"Failed to list images: {e}")
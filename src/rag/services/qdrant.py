@@ -1,20 +1,71 @@
+import asyncio
+
+import grpc
+import httpx
 from loguru import logger
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.exceptions import (
+    ResponseHandlingException,
+    UnexpectedResponse,
+)
 from tenacity import (
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
 )
 
 from rag.settings import Settings, get_settings
 
 
+# Keep idle gRPC channels alive instead of reconnecting after quiet periods
+GRPC_OPTIONS = {
+    "grpc.keepalive_time_ms": 30000,
+    "grpc.keepalive_timeout_ms": 10000,
+    "grpc.http2.max_pings_without_data": 0,
+    # Without this, no keepalive pings are sent while there are no active calls
+    "grpc.keepalive_permit_without_calls": 1,
+}
+
+# gRPC status codes for failures worth retrying: overload and transient outages
+RETRYABLE_GRPC_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+        grpc.StatusCode.ABORTED,
+    }
+)
+
+
+# Shared by every caller so the gRPC channel is opened once per process
+_qdrant_client: AsyncQdrantClient | None = None
+
+
 def create_qdrant_client(settings: Settings) -> AsyncQdrantClient:
-    return AsyncQdrantClient(
-        url=settings.qdrant.qdrant_url,
-        api_key=settings.qdrant.qdrant_api_key,
-    )
+    """
+    Get the process-wide **Qdrant** client, creating it on first use.
+    """
+    global _qdrant_client
+    if _qdrant_client is None:
+        _qdrant_client = AsyncQdrantClient(
+            url=settings.qdrant.qdrant_url,
+            api_key=settings.qdrant.qdrant_api_key,
+            prefer_grpc=True,
+            timeout=30,
+            grpc_options=GRPC_OPTIONS,
+        )
+    return _qdrant_client
+
+
+async def close_qdrant_client() -> None:
+    """
+    Close the shared **Qdrant** client, if one was created.
+    """
+    global _qdrant_client
+    if _qdrant_client is not None:
+        qdrant_client, _qdrant_client = _qdrant_client, None
+        await qdrant_client.close()
 
 
 async def create_collection(qdrant_client: AsyncQdrantClient):
@@ -55,19 +106,70 @@ async def create_collection(qdrant_client: AsyncQdrantClient):
     )
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Check whether a **Qdrant** error is transient (connection, 429 or 5xx).
+    """
+    if isinstance(exc, (ResponseHandlingException, httpx.TransportError)):
+        return True
+    if isinstance(exc, UnexpectedResponse):
+        return exc.status_code == 429 or 500 <= exc.status_code < 600
+    if isinstance(exc, grpc.aio.AioRpcError):
+        return exc.code() in RETRYABLE_GRPC_CODES
+    return False
+
+
 @retry(
-    retry=retry_if_exception_type(Exception),
+    retry=retry_if_exception(_is_retryable),
     stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
+    wait=wait_random_exponential(multiplier=0.1, max=10),
     reraise=True,
 )
-async def upsert_with_retry(
+async def _upsert_batch(
     qdrant_client: AsyncQdrantClient,
     collection_name: str,
     points: list[models.PointStruct],
+    wait: bool,
 ) -> None:
     await qdrant_client.upsert(
         collection_name=collection_name,
         points=points,
-        wait=True,
+        wait=wait,
     )
+
+
+async def upsert_with_retry(
+    qdrant_client: AsyncQdrantClient,
+    collection_name: str,
+    points: list[models.PointStruct],
+    batch_size: int = 64,
+    max_in_flight: int = 4,
+) -> None:
+    """
+    Upsert points in batches, retrying each batch on transient errors.
+
+    All but the last batch are sent concurrently without waiting for them to be
+    applied. The last one is sent once the others are acknowledged and waits,
+    so every point is applied when this returns. If a batch fails, batches not
+    yet finished are cancelled before the error is raised.
+    """
+    if not points:
+        return
+
+    batches = [points[i : i + batch_size] for i in range(0, len(points), batch_size)]
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _bounded_upsert(batch: list[models.PointStruct]):
+        async with semaphore:
+            await _upsert_batch(qdrant_client, collection_name, batch, wait=False)
+
+    tasks = [asyncio.create_task(_bounded_upsert(batch)) for batch in batches[:-1]]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the remaining batches instead of leaving them writing unobserved
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    await _upsert_batch(qdrant_client, collection_name, batches[-1], wait=True)
@@ -3,7 +3,12 @@ from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
 
 
 @lru_cache()
@@ -18,17 +23,70 @@ def find_env_file() -> str:
     return ".env"
 
 
+@lru_cache()
+def _read_env_file(
+    file_path: Path,
+    encoding: str | None,
+    case_sensitive: bool,
+    ignore_empty: bool,
+    parse_none_str: str | None,
+):
+    return DotEnvSettingsSource._static_read_env_file(
+        file_path,
+        encoding=encoding,
+        case_sensitive=case_sensitive,
+        ignore_empty=ignore_empty,
+        parse_none_str=parse_none_str,
+    )
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """
+    `.env` settings source that parses each file only once per process.
+
+    Every settings class reads the same `.env` file, so it is shared instead of
+    being reopened and reparsed for each one.
+    """
+
+    def _read_env_file(self, file_path: Path):
+        return _read_env_file(
+            file_path,
+            self.env_file_encoding,
+            self.case_sensitive,
+            self.env_ignore_empty,
+            self.env_parse_none_str,
+        )
+
+
 class BaseCommonSettings(BaseSettings):
     """
     Base settings class with common configuration.
     """
 
+    # The `.env` file is read by `CachedDotEnvSettingsSource` below, not by the
+    # default dotenv source, which would reparse it for every settings class
     model_config = SettingsConfigDict(
-        env_file=find_env_file(),
-        env_file_encoding="utf-8",
         extra="ignore",
     )
 
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            CachedDotEnvSettingsSource(
+                settings_cls, env_file=find_env_file(), env_file_encoding="utf-8"
+            ),
+            file_secret_settings,
+        )
+
 
 class QdrantSettings(BaseCommonSettings):
     """
@@ -74,8 +132,6 @@ class Settings(BaseCommonSettings):
     """
 
     model_config = SettingsConfigDict(
-        env_file=find_env_file(),
-        env_file_encoding="utf-8",
         extra="ignore",
         env_nested_delimiter="__",
     )
@@ -86,7 +142,7 @@ class Settings(BaseCommonSettings):
     openrouter: OpenRouterSettings = Field(default_factory=OpenRouterSettings)
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get the application settings.
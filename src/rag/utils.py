@@ -1,50 +1,189 @@
 """Utility functions for the RAG application."""
 
+import contextlib
+import gc
 import multiprocessing
 import os
+import sys
 import warnings
 
+try:
+    import torch
+
+    _HAS_TORCH = True
+except ImportError:
+    _HAS_TORCH = False
+
+# `forkserver` is as CUDA-safe as `spawn`, since the server process never
+# touches CUDA, but workers are forked from it instead of re-importing
+# the application. Other platforms keep `spawn`
+START_METHOD = "forkserver" if sys.platform.startswith("linux") else "spawn"
+# Heavy modules imported once in the forkserver and inherited by every worker
+FORKSERVER_PRELOAD = ["torch", "numpy"]
+
+# Environment variables `setup_multiprocessing` sets unless already present
+ENV_DEFAULTS = {
+    # Tokenizer thread pools don't survive being used across worker processes
+    "TOKENIZERS_PARALLELISM": "false",
+    # Let the CUDA caching allocator contain fragmentation itself instead of
+    # relying on `torch.cuda.empty_cache()`; only read when CUDA is first used
+    "PYTORCH_CUDA_ALLOC_CONF": (
+        "expandable_segments:True,"
+        "max_split_size_mb:256,"
+        "garbage_collection_threshold:0.8"
+    ),
+}
+
+# Set once `setup_multiprocessing` has run, so later calls return immediately
+_MP_SETUP_DONE = False
+
+# Process that imported this module; children forked from it inherit the
+# parent's CUDA allocator state, which is not safe to touch from the child
+_OWNER_PID = os.getpid()
+
+# Flat buffers handed out by `get_scratch`, one per (slot, dtype, device)
+_SCRATCH: dict[tuple, "torch.Tensor"] = {}
+
 
 def setup_multiprocessing():
     """
     Setup multiprocessing to prevent semaphore leaks.
 
-    This function should be called early in the application lifecycle
-    to ensure proper multiprocessing configuration.
+    This function should be called early in the application lifecycle, before
+    CUDA is first used, to ensure proper multiprocessing and allocator
+    configuration. Only the first call in a process has any effect.
     """
-    # Set the start method to 'spawn' which is more compatible
-    # with CUDA and prevents semaphore leaks
-    if multiprocessing.get_start_method(allow_none=True) != "spawn":
-        try:
-            multiprocessing.set_start_method("spawn", force=True)
-        except RuntimeError:
-            # Start method has already been set, which is fine
-            pass
+    global _MP_SETUP_DONE
+    if _MP_SETUP_DONE:
+        return
+
+    # Avoid plain 'fork', which is incompatible with CUDA and leaks semaphores
+    if START_METHOD == "forkserver":
+        multiprocessing.set_forkserver_preload(FORKSERVER_PRELOAD)
+    current_method = multiprocessing.get_start_method(allow_none=True)
+    if current_method is None:
+        multiprocessing.set_start_method(START_METHOD)
+    elif current_method != START_METHOD:
+        # Replacing a context that may already be in use can leak semaphores
+        warnings.warn(
+            f"multiprocessing start method is {current_method!r}, "
+            f"not forcing {START_METHOD!r}",
+            stacklevel=2,
+        )
 
     # Suppress specific multiprocessing warnings
     warnings.filterwarnings(
         "ignore", category=UserWarning, module="multiprocessing.resource_tracker"
     )
 
-    # Set environment variables to prevent CUDA multiprocessing issues
-    os.environ.setdefault("CUDA_LAUNCH_BLOCKING", "1")
-    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    defaults = dict(ENV_DEFAULTS)
+    # Synchronous kernel launches make CUDA errors point at the failing call,
+    # but serialize every launch, so they are only enabled for debugging
+    if os.environ.get("RAG_DEBUG_CUDA") == "1":
+        defaults["CUDA_LAUNCH_BLOCKING"] = "1"
+    missing = {key: value for key, value in defaults.items() if key not in os.environ}
+    if missing:
+        os.environ.update(missing)
 
+    _MP_SETUP_DONE = True
 
-def cleanup_torch_resources():
-    """Clean up PyTorch resources to prevent memory leaks."""
-    import gc
 
-    import torch
+def cleanup_torch_resources(force_empty_cache: bool = False):
+    """
+    Clean up PyTorch resources to prevent memory leaks.
+
+    Releasing the cached CUDA blocks scans the whole allocator and prevents it
+    from reusing them, so it only happens when `force_empty_cache` is set or
+    `RAG_EMPTY_CUDA_CACHE=1`. Force it only when tearing down a model or
+    recovering from an out-of-memory error, not after regular queries; with
+    the allocator settings from `setup_multiprocessing` the steady state
+    should not need it.
 
-    # Force garbage collection
+    The regular path only collects the youngest garbage generation; tensors
+    already dropped by their callers are freed by reference counting, so a
+    full collection is only needed for reference cycles on the forced path.
+
+    Does nothing in a child process forked after this module was imported.
+    """
+    if os.getpid() != _OWNER_PID:
+        return
+
+    if not (force_empty_cache or os.environ.get("RAG_EMPTY_CUDA_CACHE") == "1"):
+        gc.collect(0)
+        return
+
+    # Drop pooled scratch buffers so their memory can actually be returned
+    release_scratch()
+
+    # Force a full garbage collection so cyclic tensors are released too
     gc.collect()
 
-    # Clear CUDA cache if available
-    if torch.cuda.is_available():
+    # Clear the CUDA cache, unless this process never used CUDA; touching it
+    # then would create a context just to free an empty pool
+    if _HAS_TORCH and torch.cuda.is_initialized():
+        # Wait only for the work queued on the current stream, rather than a
+        # device-wide barrier, before its memory is released
+        event = torch.cuda.Event()
+        event.record(torch.cuda.current_stream())
+        event.synchronize()
         torch.cuda.empty_cache()
-        torch.cuda.synchronize()
-        # Clear all CUDA streams
-        for device_id in range(torch.cuda.device_count()):
-            with torch.cuda.device(device_id):
-                torch.cuda.empty_cache()
+
+
+@contextlib.contextmanager
+def torch_scratch_scope(device=None):
+    """
+    Scope for short-lived tensors that are freed without flushing the allocator.
+
+    On exit, collects the youngest garbage generation and resets the peak
+    memory statistics of `device` only. Unlike `cleanup_torch_resources` with
+    a forced flush, cached blocks stay available for the next scope and no
+    device-wide synchronization happens.
+    """
+    try:
+        yield
+    finally:
+        gc.collect(0)
+        if _HAS_TORCH and torch.cuda.is_initialized():
+            torch.cuda.reset_peak_memory_stats(device)
+
+
+def get_scratch(slot: str, shape, dtype, device) -> "torch.Tensor":
+    """
+    Get a reusable, uninitialized tensor of the given shape.
+
+    Each named `slot` owns one buffer per dtype and device, only reallocated
+    when a larger shape is requested, so batches of varying size keep reusing
+    the same allocation instead of fragmenting the CUDA caching allocator.
+    Tensors from different slots never share memory; use one slot per buffer
+    that must be alive at the same time (e.g. `"input"` and `"output"`). The
+    contents are undefined, and the tensor is overwritten by the next call
+    for the same slot, dtype and device.
+    """
+    if not _HAS_TORCH:
+        raise RuntimeError("get_scratch requires torch to be installed")
+
+    device = torch.device(device)
+    # "cuda" and "cuda:<current>" are the same device, keep a single entry
+    if device.type == "cuda" and device.index is None:
+        device = torch.device("cuda", torch.cuda.current_device())
+
+    numel = 1
+    for size in shape:
+        numel *= size
+
+    key = (slot, dtype, device)
+    buffer = _SCRATCH.get(key)
+    if buffer is None or buffer.numel() < numel:
+        buffer = _SCRATCH[key] = torch.empty(numel, dtype=dtype, device=device)
+    return buffer[:numel].view(shape)
+
+
+def release_scratch():
+    """
+    Drop every buffer handed out by `get_scratch`.
+
+    Tensors previously returned stay valid while referenced, but the pool no
+    longer keeps them alive, so a following `torch.cuda.empty_cache()` can
+    return their memory.
+    """
+    _SCRATCH.clear()